@@ -1,7 +1,19 @@
 import tkinter as tk
 import random
 import math
-from typing import Tuple, Optional
+import os
+import threading
+import multiprocessing
+import mmap
+import struct
+import sys
+import time
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from typing import Tuple, Optional, List, Dict
 
 # Configurações globais do jogo
 LARGURA = 700  # Largura da janela (canvas) principal
@@ -20,15 +32,926 @@ FORMAS = {
     "Retângulo": "green",    # Cor verde para retângulos
 }
 
+# Código numérico (1 byte) de cada figura, usado para guardar tabuleiros de forma compacta
+CODIGOS_FORMAS = list(FORMAS.keys())
+
+# Configurações de cada nível (formas, colunas e linhas)
+FORMAS_POR_NIVEL = {
+    1: {"formas": ["Círculo", "Quadrado", "Triângulo"], "colunas": 10, "linhas": 6},
+    2: {"formas": ["Círculo", "Quadrado", "Triângulo", "Retângulo"], "colunas": 12, "linhas": 7},
+    3: {"formas": list(FORMAS.keys()), "colunas": 14, "linhas": 8},
+}
+
+# Configurações do banco de tabuleiros pré-gerados
+PASTA_BANCO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "banco_tabuleiros")
+CAPACIDADE_BANCO = 50  # Número de tabuleiros guardados por nível
+TAMANHO_LOTE = 10  # Número de tabuleiros gerados por cada tarefa em segundo plano
+ASSINATURA_BANCO = b"LFBT"
+VERSAO_BANCO = 1
+CABECALHO_BANCO = struct.Struct("<4sHHH")  # Assinatura, versão, colunas e linhas dos tabuleiros guardados
+TENTATIVAS_POR_TABULEIRO = 200  # Limite de tentativas antes de aceitar um tabuleiro qualquer
+
+# Critérios de qualidade dos tabuleiros
+DESVIO_MAXIMO_EQUILIBRIO = 0.5  # Cada forma deve aparecer entre 50% e 150% da média
+FRACAO_MAXIMA_GRUPO = 0.2  # Nenhum grupo da mesma forma pode ocupar mais de 20% das células
+FRACAO_MAXIMA_ISOLADAS = 0.7  # No máximo 70% das células podem estar isoladas (grupo de 1)
+SIMULACOES_VITORIA = 5  # Jogos simulados por tabuleiro para estimar as jogadas necessárias
+JOGADAS_POR_CELULA = {1: 1.6, 2: 1.75, 3: 2.0}  # Média máxima de jogadas por célula, por nível
+
+# Configurações do desenho do tabuleiro
+MARGEM_BOLA = 3  # Margem entre a bola e os limites da célula
+FRAMES_CONTADOS = 100  # Número de frames cujas chamadas ao Tk ficam registadas
+ETIQUETA_CELULA = "celula"  # Etiqueta do canvas comum a todos os itens das células da grelha
+
+# Formato binário dos pacotes de níveis:
+#   cabeçalho: assinatura, versão, tamanho de cada entrada do índice e número de níveis
+#   índice: uma entrada de tamanho fixo por nível (colunas, linhas, formas usadas e posição dos dados)
+#   dados: as linhas de cada nível, com 4 bits por célula (duas células por byte)
+ASSINATURA_PACOTE = b"LFPK"
+VERSAO_PACOTE = 1
+CABECALHO_PACOTE = struct.Struct("<4sHHI")
+ENTRADA_PACOTE = struct.Struct("<HHBxxxQ")
+CELULA_ALEATORIA = 0xE  # Célula preenchida com uma forma aleatória do nível ao carregar
+CELULA_VAZIA = 0xF
+
+# Letras usadas no formato de texto dos níveis
+LETRAS_FORMAS = {"C": "Círculo", "Q": "Quadrado", "T": "Triângulo", "H": "Hexágono", "P": "Pentágono", "R": "Retângulo"}
+LETRA_ALEATORIA = "?"
+LETRA_VAZIA = "."
+LIMITE_BOTOES_MENU = 9  # Número máximo de botões de nível mostrados no menu
+ALTURA_GRELHA = ALTURA - 150  # Altura máxima da grelha, para ficar acima da figura do jogador
+TAMANHO_MINIMO_CELULA = 8  # Células mais pequenas do que isto não se conseguem distinguir
+
+
+def ler_numero_nivel(texto: str, quantidade_niveis: int) -> Optional[int]:
+    """
+    Converte o texto escrito no menu num número de nível entre 1 e quantidade_niveis (ou None se for inválido).
+    """
+    try:
+        nivel = int(texto.strip())
+    except ValueError:
+        return None
+    return nivel if 1 <= nivel <= quantidade_niveis else None
+
+
+def tamanho_celula(colunas: int, linhas: int) -> int:
+    """
+    Calcula o tamanho das células para a grelha caber na largura do canvas e acima do jogador.
+    """
+    return min(LARGURA // colunas, ALTURA_GRELHA // linhas)
+
+# Posição e estilo dos textos de informação (HUD) mostrados no canvas do jogo
+TEXTOS_HUD = {
+    "figura": {"x": LARGURA - 10, "y": ALTURA - 20, "font": ("Helvetica", 14, "bold"), "anchor": "se"},
+    "descricao": {"x": LARGURA - 115, "y": ALTURA - 60, "font": ("Helvetica", 14, "italic"), "anchor": "center"},
+    "nome": {"x": LARGURA // 2, "y": ALTURA // 2, "font": ("Helvetica", 24, "bold"), "anchor": "center"},
+}
+
+
+def gerar_tabuleiro(formas: List[str], colunas: int, linhas: int, rng: random.Random) -> bytes:
+    """
+    Gera um tabuleiro aleatório com as linhas preenchidas no início do nível.
+    Cada célula é guardada como o código (índice em CODIGOS_FORMAS) da sua figura.
+    """
+    codigos = [CODIGOS_FORMAS.index(forma) for forma in formas]
+    return bytes(rng.choice(codigos) for _ in range(colunas * (linhas // 2)))
+
+
+def tamanhos_grupos(tabuleiro: bytes, colunas: int) -> List[int]:
+    """
+    Calcula o tamanho de cada grupo de células vizinhas (cima, baixo, esquerda, direita) com a mesma figura.
+    """
+    linhas = len(tabuleiro) // colunas
+    visitadas = [False] * len(tabuleiro)
+    tamanhos = []
+    for inicio in range(len(tabuleiro)):
+        if visitadas[inicio]:
+            continue
+        # Percorre o grupo a partir da célula inicial (pesquisa em profundidade)
+        visitadas[inicio] = True
+        pilha = [inicio]
+        tamanho = 0
+        while pilha:
+            indice = pilha.pop()
+            tamanho += 1
+            linha, coluna = divmod(indice, colunas)
+            for l, c in ((linha - 1, coluna), (linha + 1, coluna), (linha, coluna - 1), (linha, coluna + 1)):
+                vizinho = l * colunas + c
+                if (0 <= l < linhas and 0 <= c < colunas and not visitadas[vizinho]
+                        and tabuleiro[vizinho] == tabuleiro[indice]):
+                    visitadas[vizinho] = True
+                    pilha.append(vizinho)
+        tamanhos.append(tamanho)
+    return tamanhos
+
+
+def tabuleiro_equilibrado(tabuleiro: bytes, codigos: List[int]) -> bool:
+    """
+    Verifica se todas as formas do nível aparecem num número de células próximo da média.
+    """
+    media = len(tabuleiro) / len(codigos)
+    for codigo in codigos:
+        if abs(tabuleiro.count(codigo) - media) > media * DESVIO_MAXIMO_EQUILIBRIO:
+            return False
+    return True
+
+
+def grupos_aceitaveis(tabuleiro: bytes, colunas: int) -> bool:
+    """
+    Verifica se a distribuição dos tamanhos dos grupos não tem grupos gigantes nem demasiadas células isoladas.
+    """
+    tamanhos = tamanhos_grupos(tabuleiro, colunas)
+    if max(tamanhos) > len(tabuleiro) * FRACAO_MAXIMA_GRUPO:
+        return False
+    return tamanhos.count(1) <= len(tabuleiro) * FRACAO_MAXIMA_ISOLADAS
+
+
+def jogadas_para_limpar(tabuleiro: bytes, codigos: List[int], colunas: int, linhas: int,
+                        rng: random.Random, limite: int) -> Optional[int]:
+    """
+    Simula um jogador automático com as regras do jogo e devolve o número de jogadas
+    que precisou para limpar o tabuleiro, ou None se não conseguir em `limite` jogadas.
+    Cada disparo só alcança a figura mais baixa de cada coluna. O jogador remove uma figura
+    da mesma forma, se houver; senão descarta a figura numa coluna vazia; senão acerta na coluna
+    mais alta e a figura é colada como em JogoBubbleShooter.encontrar_posicao_disponivel.
+    Perde se alguma figura chegar à última linha.
+    """
+    grade = [list(tabuleiro[l * colunas:(l + 1) * colunas]) for l in range(len(tabuleiro) // colunas)]
+    grade += [[None] * colunas for _ in range(linhas - len(grade))]
+    restantes = len(tabuleiro)
+
+    for jogada in range(limite):
+        if restantes == 0:
+            return jogada
+        tiro = rng.choice(codigos)
+
+        # Linha da figura mais baixa de cada coluna (-1 se a coluna estiver vazia)
+        mais_baixas = []
+        for coluna in range(colunas):
+            linha = linhas - 1
+            while linha >= 0 and grade[linha][coluna] is None:
+                linha -= 1
+            mais_baixas.append(linha)
+
+        alvo = next((c for c, l in enumerate(mais_baixas) if l >= 0 and grade[l][c] == tiro), None)
+        if alvo is not None:
+            grade[mais_baixas[alvo]][alvo] = None
+            restantes -= 1
+            continue
+        if -1 in mais_baixas:
+            continue  # A figura sobe até ao topo e é descartada
+
+        # Acerta na coluna com a figura mais baixa mais acima e procura onde colar a figura
+        coluna = mais_baixas.index(min(mais_baixas))
+        posicao = None
+        if mais_baixas[coluna] + 1 < linhas:
+            posicao = (mais_baixas[coluna] + 1, coluna)  # Célula livre seguinte na mesma coluna
+        else:
+            for c in (coluna - 1, coluna + 1):
+                if 0 <= c < colunas:
+                    l = next((l for l in range(linhas) if grade[l][c] is None), None)
+                    if l is not None:
+                        posicao = (l, c)  # Primeira célula livre de uma coluna adjacente
+                        break
+        if posicao is None:
+            continue  # Não há célula livre e a figura desaparece
+        grade[posicao[0]][posicao[1]] = tiro
+        restantes += 1
+        if posicao[0] == linhas - 1:
+            return None  # As figuras chegaram à linha do jogador
+    return limite if restantes == 0 else None
+
+
+def tabuleiro_vencivel(tabuleiro: bytes, nivel: int, rng: random.Random) -> bool:
+    """
+    Verifica se o jogador automático limpa o tabuleiro em todas as simulações
+    e se, em média, precisa de no máximo JOGADAS_POR_CELULA jogadas por célula.
+    """
+    config = FORMAS_POR_NIVEL[nivel]
+    codigos = [CODIGOS_FORMAS.index(forma) for forma in config["formas"]]
+    limite = len(tabuleiro) * JOGADAS_POR_CELULA[nivel]
+    total = 0
+    for _ in range(SIMULACOES_VITORIA):
+        jogadas = jogadas_para_limpar(tabuleiro, codigos, config["colunas"], config["linhas"], rng, int(limite * 2))
+        if jogadas is None:
+            return False
+        total += jogadas
+    return total / SIMULACOES_VITORIA <= limite
+
+
+def tabuleiro_aceitavel(tabuleiro: bytes, nivel: int, rng: random.Random) -> bool:
+    """
+    Aplica todos os critérios de qualidade (equilíbrio, grupos e vitória) a um tabuleiro.
+    """
+    config = FORMAS_POR_NIVEL[nivel]
+    codigos = [CODIGOS_FORMAS.index(forma) for forma in config["formas"]]
+    return (tabuleiro_equilibrado(tabuleiro, codigos)
+            and grupos_aceitaveis(tabuleiro, config["colunas"])
+            and tabuleiro_vencivel(tabuleiro, nivel, rng))
+
+
+def gerar_tabuleiro_valido(nivel: int, rng: random.Random) -> Optional[bytes]:
+    """
+    Gera tabuleiros até encontrar um que cumpra os critérios de qualidade do nível.
+    Devolve None se nenhum passar ao fim de TENTATIVAS_POR_TABULEIRO tentativas.
+    """
+    config = FORMAS_POR_NIVEL[nivel]
+    for _ in range(TENTATIVAS_POR_TABULEIRO):
+        tabuleiro = gerar_tabuleiro(config["formas"], config["colunas"], config["linhas"], rng)
+        if tabuleiro_aceitavel(tabuleiro, nivel, rng):
+            return tabuleiro
+    return None
+
+
+def gerar_lote_tabuleiros(nivel: int, quantidade: int, semente: int) -> bytes:
+    """
+    Gera um lote de tabuleiros válidos concatenados. Executado pelos processos do banco.
+    As tentativas falhadas são descartadas, por isso o lote pode ter menos de `quantidade` tabuleiros.
+    """
+    rng = random.Random(semente)
+    tabuleiros = (gerar_tabuleiro_valido(nivel, rng) for _ in range(quantidade))
+    return b"".join(tabuleiro for tabuleiro in tabuleiros if tabuleiro is not None)
+
+
+class BancoTabuleiros:
+    """
+    Banco de tabuleiros pré-gerados. Os tabuleiros ficam numa fila em memória por nível,
+    alimentada por processos em segundo plano, e são guardados em disco ao encerrar
+    (um ficheiro por nível, com um cabeçalho e registos de 1 byte por célula).
+    """
+    def __init__(self, pasta: str = PASTA_BANCO, capacidade: int = CAPACIDADE_BANCO,
+                 trabalhadores: Optional[int] = None):
+        """
+        Inicializa o banco com os tabuleiros guardados em disco e arranca a thread de reabastecimento.
+        Os processos de geração só são criados no primeiro reabastecimento.
+        """
+        self.pasta = pasta
+        self.capacidade = capacidade
+        self.trabalhadores = trabalhadores
+
+        self._executor = None  # Conjunto de processos que geram tabuleiros em segundo plano
+        self._trinco = threading.Condition(threading.RLock())  # Protege as filas e os pedidos
+        self._filas = {nivel: deque(self.ler(nivel)) for nivel in FORMAS_POR_NIVEL}  # Tabuleiros prontos
+        self._pendentes = {nivel: 0 for nivel in FORMAS_POR_NIVEL}  # Tabuleiros em geração
+        self._pedidos = set()  # Níveis à espera de reabastecimento
+        self._encerrado = False
+
+        # Os pedidos aos processos são feitos nesta thread, fora da thread do Tk
+        self._thread = threading.Thread(target=self._reabastecer_continuamente, daemon=True)
+        self._thread.start()
+
+    def tamanho_registo(self, nivel: int) -> int:
+        """
+        Devolve o número de bytes ocupados por um tabuleiro do nível.
+        """
+        config = FORMAS_POR_NIVEL[nivel]
+        return config["colunas"] * (config["linhas"] // 2)
+
+    def caminho(self, nivel: int) -> str:
+        """
+        Devolve o caminho do ficheiro do banco para o nível.
+        """
+        return os.path.join(self.pasta, f"nivel_{nivel}.bin")
+
+    def cabecalho(self, nivel: int) -> bytes:
+        """
+        Devolve o cabeçalho que identifica os ficheiros de tabuleiros do nível.
+        """
+        config = FORMAS_POR_NIVEL[nivel]
+        return CABECALHO_BANCO.pack(ASSINATURA_BANCO, VERSAO_BANCO, config["colunas"], config["linhas"])
+
+    def ler(self, nivel: int) -> List[bytes]:
+        """
+        Lê os tabuleiros guardados para o nível. Ignora o ficheiro se o cabeçalho
+        não corresponder às dimensões atuais do nível.
+        """
+        try:
+            with open(self.caminho(nivel), "rb") as ficheiro:
+                dados = ficheiro.read()
+        except OSError:
+            return []
+        if dados[:CABECALHO_BANCO.size] != self.cabecalho(nivel):
+            return []
+        tamanho = self.tamanho_registo(nivel)
+        dados = dados[CABECALHO_BANCO.size:]
+        return [dados[i:i + tamanho] for i in range(0, len(dados) - tamanho + 1, tamanho)]
+
+    def guardar(self) -> None:
+        """
+        Guarda em disco os tabuleiros de todas as filas.
+        """
+        os.makedirs(self.pasta, exist_ok=True)
+        with self._trinco:
+            filas = {nivel: b"".join(fila) for nivel, fila in self._filas.items()}
+        for nivel, dados in filas.items():
+            # Escreve num ficheiro temporário para não deixar um banco a meio se o jogo for interrompido
+            temporario = self.caminho(nivel) + ".tmp"
+            with open(temporario, "wb") as ficheiro:
+                ficheiro.write(self.cabecalho(nivel) + dados)
+            os.replace(temporario, self.caminho(nivel))
+
+    def quantidade(self, nivel: int) -> int:
+        """
+        Devolve o número de tabuleiros prontos para o nível.
+        """
+        return len(self._filas[nivel])
+
+    def retirar(self, nivel: int) -> Optional[bytes]:
+        """
+        Retira um tabuleiro da fila do nível e pede a reposição em segundo plano.
+        Devolve None se o banco estiver vazio.
+        """
+        with self._trinco:
+            fila = self._filas[nivel]
+            tabuleiro = fila.popleft() if fila else None
+        self.reabastecer(nivel)
+        return tabuleiro
+
+    def reabastecer(self, nivel: int) -> None:
+        """
+        Pede à thread de reabastecimento os tabuleiros que faltam para encher o banco do nível.
+        """
+        with self._trinco:
+            self._pedidos.add(nivel)
+            self._trinco.notify()
+
+    def _reabastecer_continuamente(self) -> None:
+        """
+        Ciclo da thread de reabastecimento: espera por pedidos e envia lotes aos processos.
+        """
+        while True:
+            with self._trinco:
+                while not self._pedidos and not self._encerrado:
+                    self._trinco.wait()
+                if self._encerrado:
+                    return
+                niveis, self._pedidos = self._pedidos, set()
+            for nivel in niveis:
+                self._submeter_em_falta(nivel)
+
+    def _submeter_em_falta(self, nivel: int) -> None:
+        """
+        Envia aos processos os lotes necessários para encher o banco do nível.
+        """
+        with self._trinco:
+            if self._encerrado:
+                return
+            em_falta = self.capacidade - len(self._filas[nivel]) - self._pendentes[nivel]
+            while em_falta > 0:
+                if self._executor is None:
+                    try:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.trabalhadores,
+                            mp_context=multiprocessing.get_context("spawn"),  # Não copia o estado do Tk
+                        )
+                    except (OSError, NotImplementedError):
+                        return  # Sem processos disponíveis, o jogo gera os tabuleiros na hora
+                lote = min(TAMANHO_LOTE, em_falta)
+                try:
+                    futuro = self._executor.submit(gerar_lote_tabuleiros, nivel, lote, random.getrandbits(64))
+                except BrokenProcessPool:
+                    self._executor = None  # Um processo terminou mal; tenta de novo no próximo pedido
+                    return
+                self._pendentes[nivel] += lote
+                em_falta -= lote
+                futuro.add_done_callback(lambda f, n=nivel, q=lote: self._lote_concluido(n, q, f))
+
+    def _lote_concluido(self, nivel: int, quantidade: int, futuro: Future) -> None:
+        """
+        Junta à fila um lote gerado em segundo plano (não é executado na thread do Tk).
+        """
+        tamanho = self.tamanho_registo(nivel)
+        dados = b""
+        if not futuro.cancelled() and futuro.exception() is None:
+            dados = futuro.result()
+        # O fim do lote pendente e a entrada dos tabuleiros na fila acontecem de uma só vez
+        with self._trinco:
+            self._pendentes[nivel] -= quantidade
+            self._filas[nivel].extend(dados[i:i + tamanho] for i in range(0, len(dados) - tamanho + 1, tamanho))
+
+    def encerrar(self) -> None:
+        """
+        Termina a thread e os processos em segundo plano e guarda as filas em disco.
+        """
+        with self._trinco:
+            self._encerrado = True
+            self._trinco.notify()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        self.guardar()
+
+
+def ler_niveis_texto(texto: str) -> List[dict]:
+    """
+    Lê níveis no formato de texto. Cada nível começa com uma linha "nivel" seguida dos
+    nomes das formas usadas, e continua com uma linha de letras por linha da grelha:
+    C, Q, T, H, P e R para as figuras, "?" para uma figura aleatória e "." para vazio.
+    Linhas em branco e começadas por "#" são ignoradas.
+    """
+    letras = {letra: CODIGOS_FORMAS.index(forma) for letra, forma in LETRAS_FORMAS.items()}
+    letras[LETRA_ALEATORIA] = CELULA_ALEATORIA
+    letras[LETRA_VAZIA] = CELULA_VAZIA
+
+    niveis = []
+    for numero, linha in enumerate(texto.splitlines(), start=1):
+        linha = linha.strip()
+        if not linha or linha.startswith("#"):
+            continue
+        if linha.split()[0] == "nivel":
+            formas = linha.split()[1:]
+            for forma in formas:
+                if forma not in FORMAS:
+                    raise ValueError(f"Linha {numero}: forma desconhecida {forma!r}")
+            if not formas:
+                raise ValueError(f"Linha {numero}: o nível não indica as formas usadas")
+            niveis.append({"formas": formas, "colunas": 0, "linhas": 0, "celulas": []})
+            continue
+        if not niveis:
+            raise ValueError(f"Linha {numero}: grelha antes da primeira linha \"nivel\"")
+
+        nivel = niveis[-1]
+        if nivel["celulas"] and len(linha) != nivel["colunas"]:
+            raise ValueError(f"Linha {numero}: esperadas {nivel['colunas']} colunas, encontradas {len(linha)}")
+        try:
+            nivel["celulas"].append([letras[letra] for letra in linha])
+        except KeyError as erro:
+            raise ValueError(f"Linha {numero}: letra desconhecida {erro.args[0]!r}") from None
+        # Uma figura fixa de uma forma que o jogador nunca recebe impede a vitória
+        for letra in linha:
+            if letra in LETRAS_FORMAS and LETRAS_FORMAS[letra] not in nivel["formas"]:
+                raise ValueError(f"Linha {numero}: {LETRAS_FORMAS[letra]} ({letra!r}) não é uma forma do nível")
+        nivel["colunas"] = len(linha)
+        nivel["linhas"] += 1
+
+    for numero, nivel in enumerate(niveis, start=1):
+        if not nivel["celulas"]:
+            raise ValueError(f"Nível {numero}: o nível não tem grelha")
+        if tamanho_celula(nivel["colunas"], nivel["linhas"]) < TAMANHO_MINIMO_CELULA:
+            raise ValueError(f"Nível {numero}: grelha de {nivel['colunas']}x{nivel['linhas']} não cabe no ecrã")
+    return niveis
+
+
+def escrever_pacote(caminho: str, niveis: List[dict]) -> None:
+    """
+    Escreve os níveis (no formato devolvido por ler_niveis_texto) num pacote binário.
+    """
+    with open(caminho, "wb") as ficheiro:
+        ficheiro.write(CABECALHO_PACOTE.pack(ASSINATURA_PACOTE, VERSAO_PACOTE, ENTRADA_PACOTE.size, len(niveis)))
+
+        # Índice: a posição dos dados de cada nível é conhecida antes de os escrever
+        posicao = CABECALHO_PACOTE.size + ENTRADA_PACOTE.size * len(niveis)
+        for nivel in niveis:
+            mascara = sum(1 << CODIGOS_FORMAS.index(forma) for forma in nivel["formas"])
+            ficheiro.write(ENTRADA_PACOTE.pack(nivel["colunas"], nivel["linhas"], mascara, posicao))
+            posicao += (nivel["colunas"] + 1) // 2 * nivel["linhas"]
+
+        # Dados: cada linha ocupa sempre (colunas + 1) // 2 bytes
+        for nivel in niveis:
+            for linha in nivel["celulas"]:
+                if len(linha) % 2:
+                    linha = linha + [CELULA_VAZIA]
+                ficheiro.write(bytes(linha[i] << 4 | linha[i + 1] for i in range(0, len(linha), 2)))
+
+
+def converter_texto_para_pacote(caminho_texto: str, caminho_pacote: str) -> int:
+    """
+    Converte um ficheiro de níveis em texto num pacote binário. Devolve o número de níveis.
+    """
+    with open(caminho_texto, encoding="utf-8") as ficheiro:
+        niveis = ler_niveis_texto(ficheiro.read())
+    escrever_pacote(caminho_pacote, niveis)
+    return len(niveis)
+
+
+class PacoteNiveis:
+    """
+    Pacote de níveis aberto com mmap: só o cabeçalho é lido ao abrir,
+    e cada nível é lido do disco apenas quando é pedido.
+    """
+    def __init__(self, caminho: str):
+        """
+        Abre o pacote e valida o cabeçalho.
+        """
+        self.caminho = caminho
+        self.ficheiro = open(caminho, "rb")
+        try:
+            self.mapa = mmap.mmap(self.ficheiro.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self.mapa) < CABECALHO_PACOTE.size:
+                raise ValueError(f"{caminho}: ficheiro demasiado pequeno para um pacote de níveis")
+            assinatura, versao, tamanho_entrada, self.quantidade = CABECALHO_PACOTE.unpack_from(self.mapa, 0)
+            if assinatura != ASSINATURA_PACOTE:
+                raise ValueError(f"{caminho}: não é um pacote de níveis")
+            if versao != VERSAO_PACOTE or tamanho_entrada != ENTRADA_PACOTE.size:
+                raise ValueError(f"{caminho}: versão {versao} do pacote não suportada")
+            if len(self.mapa) < CABECALHO_PACOTE.size + ENTRADA_PACOTE.size * self.quantidade:
+                raise ValueError(f"{caminho}: o índice do pacote está incompleto")
+        except Exception:
+            self.fechar()
+            raise
+
+    def nivel(self, numero: int) -> dict:
+        """
+        Lê o nível indicado (a partir de 1), com as mesmas chaves de FORMAS_POR_NIVEL
+        e a grelha em "celulas" (códigos de CODIGOS_FORMAS, CELULA_ALEATORIA ou CELULA_VAZIA).
+        """
+        if not 1 <= numero <= self.quantidade:
+            raise IndexError(f"O pacote tem {self.quantidade} níveis, pedido o nível {numero}")
+        entrada = CABECALHO_PACOTE.size + ENTRADA_PACOTE.size * (numero - 1)
+        colunas, linhas, mascara, posicao = ENTRADA_PACOTE.unpack_from(self.mapa, entrada)
+        largura = (colunas + 1) // 2
+
+        # Valida a entrada do índice antes de ler os dados
+        if colunas == 0 or linhas == 0:
+            raise ValueError(f"{self.caminho}: o nível {numero} não tem células")
+        if tamanho_celula(colunas, linhas) < TAMANHO_MINIMO_CELULA:
+            raise ValueError(f"{self.caminho}: a grelha {colunas}x{linhas} do nível {numero} não cabe no ecrã")
+        if mascara == 0 or mascara >> len(CODIGOS_FORMAS):
+            raise ValueError(f"{self.caminho}: o nível {numero} tem formas inválidas")
+        if posicao + largura * linhas > len(self.mapa):
+            raise ValueError(f"{self.caminho}: os dados do nível {numero} estão incompletos")
+
+        validos = set(range(len(CODIGOS_FORMAS))) | {CELULA_ALEATORIA, CELULA_VAZIA}
+        do_nivel = {i for i in range(len(CODIGOS_FORMAS)) if mascara & (1 << i)} | {CELULA_ALEATORIA, CELULA_VAZIA}
+        celulas = []
+        for linha in range(linhas):
+            inicio = posicao + linha * largura
+            dados = self.mapa[inicio:inicio + largura]
+            # Separa os dois códigos de 4 bits de cada byte e descarta a célula de enchimento
+            celulas.append([codigo for byte in dados for codigo in (byte >> 4, byte & 0xF)][:colunas])
+            if not validos.issuperset(celulas[-1]):
+                raise ValueError(f"{self.caminho}: o nível {numero} tem códigos de célula inválidos")
+            if not do_nivel.issuperset(celulas[-1]):
+                raise ValueError(f"{self.caminho}: o nível {numero} tem figuras de formas que não são do nível")
+
+        formas = [forma for i, forma in enumerate(CODIGOS_FORMAS) if mascara & (1 << i)]
+        return {"formas": formas, "colunas": colunas, "linhas": linhas, "celulas": celulas}
+
+    def fechar(self) -> None:
+        """
+        Liberta o mapeamento e fecha o ficheiro.
+        """
+        if getattr(self, "mapa", None) is not None:
+            self.mapa.close()
+            self.mapa = None
+        self.ficheiro.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def medir_pacotes(quantidades=(10, 100, 1000, 10000), colunas: int = 14, linhas: int = 8,
+                  repeticoes: int = 1000) -> List[Tuple[int, int, float, float]]:
+    """
+    Mede o tempo de abrir um pacote e de mudar de nível em pacotes de tamanhos diferentes.
+    Devolve (níveis, bytes, ms a abrir, ms por mudança de nível) para cada quantidade.
+    """
+    rng = random.Random(0)
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        for quantidade in quantidades:
+            caminho = os.path.join(pasta, f"pacote_{quantidade}.lfp")
+            niveis = [
+                {"formas": CODIGOS_FORMAS, "colunas": colunas, "linhas": linhas,
+                 "celulas": [[rng.randrange(len(CODIGOS_FORMAS)) for _ in range(colunas)] for _ in range(linhas)]}
+                for _ in range(quantidade)
+            ]
+            escrever_pacote(caminho, niveis)
+
+            inicio = time.perf_counter()
+            pacote = PacoteNiveis(caminho)
+            tempo_abrir = time.perf_counter() - inicio
+
+            sorteados = [rng.randint(1, quantidade) for _ in range(repeticoes)]
+            inicio = time.perf_counter()
+            for numero in sorteados:
+                pacote.nivel(numero)
+            tempo_mudar = (time.perf_counter() - inicio) / repeticoes
+            pacote.fechar()
+
+            resultados.append((quantidade, os.path.getsize(caminho), tempo_abrir * 1000, tempo_mudar * 1000))
+    return resultados
+
+
+class TabuleiroJogo:
+    """
+    Modelo do tabuleiro: guarda o estado do jogo sem desenhar nada
+    e avisa os observadores de cada alteração (célula, tiro, mira ou texto).
+    """
+    def __init__(self, colunas: int, linhas: int, tamanho_celula: int):
+        """
+        Inicializa um tabuleiro vazio com as dimensões indicadas.
+        """
+        self.colunas = colunas
+        self.linhas = linhas
+        self.tamanho_celula = tamanho_celula
+        self.celulas: List[List[Optional[str]]] = [[None] * colunas for _ in range(linhas)]
+        self.tiro = None  # (tipo_figura, x, y) da figura do jogador, com (x, y) no canto superior esquerdo
+        self.mira = None  # Coordenadas (x1, y1, x2, y2) da linha de direção
+        self.textos: Dict[str, str] = {}  # Textos de informação, indexados pela chave em TEXTOS_HUD
+        self.observadores = []  # Funções chamadas com cada evento de alteração
+
+    def observar(self, observador) -> None:
+        """
+        Regista uma função que recebe os eventos: ("celula", linha, coluna), ("tiro",), ("mira",) e ("texto", chave).
+        """
+        self.observadores.append(observador)
+
+    def emitir(self, *evento) -> None:
+        """
+        Envia um evento de alteração a todos os observadores.
+        """
+        for observador in self.observadores:
+            observador(evento)
+
+    def calcular_posicao_celula(self, linha: int, coluna: int) -> Tuple[int, int]:
+        """
+        Calcula as coordenadas (x, y) do canto superior esquerdo de uma célula na grelha.
+        """
+        return coluna * self.tamanho_celula, linha * self.tamanho_celula
+
+    def coordenadas_bola(self, x: float, y: float) -> Tuple[float, float, float, float]:
+        """
+        Devolve o retângulo (x1, y1, x2, y2) da bola desenhada numa célula com canto superior esquerdo em (x, y).
+        """
+        return (x + MARGEM_BOLA, y + MARGEM_BOLA,
+                x + self.tamanho_celula - MARGEM_BOLA, y + self.tamanho_celula - MARGEM_BOLA)
+
+    def definir_celula(self, linha: int, coluna: int, tipo_figura: Optional[str]) -> None:
+        """
+        Coloca uma figura numa célula (ou limpa-a com None), emitindo um evento apenas se mudar.
+        """
+        if self.celulas[linha][coluna] != tipo_figura:
+            self.celulas[linha][coluna] = tipo_figura
+            self.emitir("celula", linha, coluna)
+
+    def carregar(self, celulas: List[List[Optional[str]]]) -> None:
+        """
+        Substitui o conteúdo da grelha; só as células diferentes emitem eventos.
+        """
+        for linha in range(self.linhas):
+            for coluna in range(self.colunas):
+                self.definir_celula(linha, coluna, celulas[linha][coluna])
+
+    def definir_tiro(self, tipo_figura: Optional[str], x: float = 0, y: float = 0) -> None:
+        """
+        Cria a figura do jogador na posição indicada (ou remove-a com None).
+        """
+        tiro = (tipo_figura, x, y) if tipo_figura is not None else None
+        if self.tiro != tiro:
+            self.tiro = tiro
+            self.emitir("tiro")
+
+    def mover_tiro(self, dx: float, dy: float) -> None:
+        """
+        Desloca a figura do jogador.
+        """
+        tipo_figura, x, y = self.tiro
+        self.definir_tiro(tipo_figura, x + dx, y + dy)
+
+    def definir_mira(self, mira: Optional[Tuple[float, float, float, float]]) -> None:
+        """
+        Atualiza (ou remove com None) a linha de direção do disparo.
+        """
+        if self.mira != mira:
+            self.mira = mira
+            self.emitir("mira")
+
+    def definir_texto(self, chave: str, texto: str) -> None:
+        """
+        Atualiza um texto de informação.
+        """
+        if self.textos.get(chave) != texto:
+            self.textos[chave] = texto
+            self.emitir("texto", chave)
+
+
+class ContadorChamadasTk:
+    """Envolve um widget do Tk e conta as chamadas feitas através dele."""
+    def __init__(self, widget: tk.Widget):
+        """
+        Inicializa o contador a zero.
+        """
+        self.widget = widget
+        self.chamadas = 0
+
+    def __getattr__(self, nome: str):
+        """
+        Devolve o método do widget embrulhado numa função que incrementa o contador.
+        """
+        metodo = getattr(self.widget, nome)
+
+        def chamar(*args, **kwargs):
+            self.chamadas += 1
+            return metodo(*args, **kwargs)
+        return chamar
+
+
+class RenderizadorTabuleiro:
+    """
+    Desenha um TabuleiroJogo no canvas. Junta os eventos do modelo num conjunto de
+    elementos "sujos" e, uma vez por frame, atualiza apenas os itens que mudaram.
+    """
+    def __init__(self, canvas: tk.Canvas, tabuleiro: TabuleiroJogo):
+        """
+        Inicializa o renderizador e regista-o como observador do tabuleiro.
+        """
+        self.canvas = ContadorChamadasTk(canvas)  # Todos os desenhos passam pelo contador
+        self.tabuleiro = tabuleiro
+        self.sujos = set()  # Elementos alterados desde o último frame
+        self.frame_agendado = None  # Identificador do after_idle do próximo frame
+        self.chamadas_por_frame = deque(maxlen=FRAMES_CONTADOS)  # Chamadas ao Tk em cada frame
+        self.celulas_criadas = False  # Indica se o frame atual criou itens de células
+
+        # Itens atualmente desenhados no canvas
+        self.itens_celulas = {}  # (linha, coluna) -> (tipo_figura, bola, figura)
+        self.itens_tiro = None  # (tipo_figura, x, y, bola, figura)
+        self.item_mira = None
+        self.itens_textos = {}  # chave -> item de texto
+
+        tabuleiro.observar(self.marcar_sujo)
+
+    def marcar_sujo(self, evento: tuple) -> None:
+        """
+        Regista o elemento alterado e agenda o próximo frame, se ainda não estiver agendado.
+        """
+        self.sujos.add(evento)
+        if self.frame_agendado is None:
+            self.frame_agendado = self.canvas.widget.after_idle(self.desenhar_frame)
+
+    def desenhar_frame(self) -> None:
+        """
+        Atualiza no canvas todos os elementos sujos e regista o número de chamadas ao Tk.
+        """
+        self.frame_agendado = None
+        self.canvas.chamadas = 0
+        self.celulas_criadas = False
+        sujos, self.sujos = self.sujos, set()
+        for evento in sujos:
+            if evento[0] == "celula":
+                self.desenhar_celula(evento[1], evento[2])
+            elif evento[0] == "tiro":
+                self.desenhar_tiro()
+            elif evento[0] == "mira":
+                self.desenhar_mira()
+            elif evento[0] == "texto":
+                self.desenhar_texto(evento[1])
+        if self.celulas_criadas:
+            # Células novas ficam por cima dos itens antigos; baixa-as para o tiro,
+            # a linha de direção e os textos continuarem visíveis
+            self.canvas.tag_lower(ETIQUETA_CELULA)
+        self.chamadas_por_frame.append(self.canvas.chamadas)
+
+    def encerrar(self) -> None:
+        """
+        Cancela o frame agendado (usado antes de destruir o canvas).
+        """
+        if self.frame_agendado is not None:
+            self.canvas.widget.after_cancel(self.frame_agendado)
+            self.frame_agendado = None
+
+    def desenhar_celula(self, linha: int, coluna: int) -> None:
+        """
+        Sincroniza os itens de uma célula com o seu estado no modelo.
+        """
+        tipo_figura = self.tabuleiro.celulas[linha][coluna]
+        itens = self.itens_celulas.pop((linha, coluna), None)
+        if itens is not None and itens[0] == tipo_figura:
+            self.itens_celulas[(linha, coluna)] = itens  # Nada mudou desde o último frame
+            return
+        if itens is not None:
+            self.canvas.delete(itens[1])  # Remove a bola
+            self.canvas.delete(itens[2])  # Remove a figura
+        if tipo_figura is not None:
+            x, y = self.tabuleiro.calcular_posicao_celula(linha, coluna)
+            bola, figura = self.desenhar_bola_com_figura(x, y, tipo_figura, FORMAS[tipo_figura], (ETIQUETA_CELULA,))
+            self.itens_celulas[(linha, coluna)] = (tipo_figura, bola, figura)
+            self.celulas_criadas = True
+
+    def desenhar_tiro(self) -> None:
+        """
+        Sincroniza a figura do jogador: desloca os itens existentes ou recria-os se a figura mudou.
+        """
+        tiro = self.tabuleiro.tiro
+        if self.itens_tiro is not None and tiro is not None and self.itens_tiro[0] == tiro[0]:
+            tipo_figura, x, y, bola, figura = self.itens_tiro
+            dx, dy = tiro[1] - x, tiro[2] - y
+            if dx or dy:
+                self.canvas.move(bola, dx, dy)
+                self.canvas.move(figura, dx, dy)
+                self.itens_tiro = (tipo_figura, tiro[1], tiro[2], bola, figura)
+            return
+        if self.itens_tiro is not None:
+            self.canvas.delete(self.itens_tiro[3])
+            self.canvas.delete(self.itens_tiro[4])
+            self.itens_tiro = None
+        if tiro is not None:
+            tipo_figura, x, y = tiro
+            bola, figura = self.desenhar_bola_com_figura(x, y, tipo_figura, FORMAS[tipo_figura])
+            self.itens_tiro = (tipo_figura, x, y, bola, figura)
+
+    def desenhar_mira(self) -> None:
+        """
+        Sincroniza a linha de direção do disparo.
+        """
+        mira = self.tabuleiro.mira
+        if mira is None:
+            if self.item_mira is not None:
+                self.canvas.delete(self.item_mira)
+                self.item_mira = None
+        elif self.item_mira is None:
+            self.item_mira = self.canvas.create_line(*mira, fill="gray", dash=(4, 2))
+        else:
+            self.canvas.coords(self.item_mira, *mira)
+
+    def desenhar_texto(self, chave: str) -> None:
+        """
+        Sincroniza um texto de informação, criando-o na primeira vez que é mostrado.
+        """
+        texto = self.tabuleiro.textos[chave]
+        if chave in self.itens_textos:
+            self.canvas.itemconfig(self.itens_textos[chave], text=texto)
+        else:
+            estilo = TEXTOS_HUD[chave]
+            self.itens_textos[chave] = self.canvas.create_text(
+                estilo["x"], estilo["y"], text=texto, font=estilo["font"], fill="black", anchor=estilo["anchor"]
+            )
+
+    def desenhar_bola_com_figura(self, x: float, y: float, tipo_figura: str, cor: str,
+                                 etiquetas: Tuple[str, ...] = ()):
+        """
+        Desenha uma bola no canvas com uma figura geométrica centralizada dentro.
+        """
+        # Desenha a bola (um círculo cinzento)
+        bola = self.canvas.create_oval(
+            *self.tabuleiro.coordenadas_bola(x, y), fill="lightgray", outline="black", tags=etiquetas
+        )
+        # Desenha a figura geométrica centralizada dentro da bola
+        figura = self.desenhar_figura_centralizada(x, y, tipo_figura, cor, etiquetas)
+        return bola, figura  # Retorna os elementos criados
+
+    def desenhar_figura_centralizada(self, x: float, y: float, tipo_figura: str, cor: str,
+                                     etiquetas: Tuple[str, ...] = ()):
+        """
+        Desenha a figura geométrica centralizada dentro de uma célula.
+        """
+        tamanho = self.tabuleiro.tamanho_celula  # Tamanho da célula no nível atual
+        centro_x = x + tamanho // 2  # Calcula o centro da célula em x
+        centro_y = y + tamanho // 2  # Calcula o centro da célula em y
+
+        # Desenha a figura com base no tipo
+        if tipo_figura == "Círculo":
+            raio = tamanho // 3  # Raio proporcional ao tamanho da célula
+            return self.canvas.create_oval(
+                centro_x - raio, centro_y - raio, centro_x + raio, centro_y + raio, fill=cor, tags=etiquetas
+            )
+        elif tipo_figura == "Quadrado":
+            lado = tamanho // 2  # Lado proporcional ao tamanho da célula
+            return self.canvas.create_rectangle(
+                centro_x - lado // 2, centro_y - lado // 2,
+                centro_x + lado // 2, centro_y + lado // 2, fill=cor, tags=etiquetas
+            )
+        elif tipo_figura == "Triângulo":
+            return self.desenhar_poligono(centro_x, centro_y, 3, tamanho // 3, cor, etiquetas)
+        elif tipo_figura == "Hexágono":
+            return self.desenhar_poligono(centro_x, centro_y, 6, tamanho // 3, cor, etiquetas)
+        elif tipo_figura == "Pentágono":
+            return self.desenhar_poligono(centro_x, centro_y, 5, tamanho // 3, cor, etiquetas)
+        elif tipo_figura == "Retângulo":
+            largura = tamanho // 2
+            altura = tamanho // 3
+            return self.canvas.create_rectangle(
+                centro_x - largura // 2, centro_y - altura // 2,
+                centro_x + largura // 2, centro_y + altura // 2, fill=cor, tags=etiquetas
+            )
+
+    def desenhar_poligono(self, x: float, y: float, lados: int, raio: int, cor: str,
+                          etiquetas: Tuple[str, ...] = ()):
+        """
+        Desenha um polígono regular no canvas.
+        """
+        # Calcula os pontos (vértices) do polígono
+        pontos = [
+            (x + raio * math.cos(2 * math.pi * i / lados),
+             y + raio * math.sin(2 * math.pi * i / lados))
+            for i in range(lados)
+        ]
+        # Desenha o polígono no canvas
+        return self.canvas.create_polygon(pontos, fill=cor, outline="black", tags=etiquetas)
+
 
 class MenuInicial:
     """Classe responsável por criar o menu inicial do jogo."""
-    def __init__(self, master: tk.Tk, iniciar_jogo_callback):
+    def __init__(self, master: tk.Tk, iniciar_jogo_callback, quantidade_niveis: int = 3):
         """
         Inicializa o menu inicial com título, botões e explicação.
         """
         self.master = master
         self.iniciar_jogo_callback = iniciar_jogo_callback
+        self.quantidade_niveis = quantidade_niveis
 
         # Cria o frame principal para o menu inicial
         self.frame_menu = tk.Frame(master, bg="#f0f8ff", width=LARGURA, height=ALTURA)
@@ -64,8 +987,8 @@ class MenuInicial:
         self.botoes_frame = tk.Frame(self.frame_menu, bg="#f0f8ff")  # Container para os botões
         self.botoes_frame.pack(pady=20)
 
-        # Loop para criar os botões dos níveis (Nível 1, Nível 2 e Nível 3)
-        for nivel in range(1, 4):  # Três níveis disponíveis
+        # Loop para criar os botões dos níveis (Nível 1, Nível 2, ...), três por linha
+        for nivel in range(1, min(quantidade_niveis, LIMITE_BOTOES_MENU) + 1):
             botao = tk.Button(
                 self.botoes_frame,
                 text=f"Nível {nivel}",
@@ -78,7 +1001,36 @@ class MenuInicial:
                 height=2,
                 command=lambda n=nivel: self.selecionar_nivel(n),  # Callback ao clicar no botão
             )
-            botao.grid(row=0, column=nivel - 1, padx=10)  # Adiciona os botões horizontalmente com espaçamento
+            # Adiciona os botões horizontalmente com espaçamento
+            botao.grid(row=(nivel - 1) // 3, column=(nivel - 1) % 3, padx=10, pady=5)
+
+        # Com mais níveis do que botões (pacotes grandes), qualquer nível é escolhido pelo número
+        if quantidade_niveis > LIMITE_BOTOES_MENU:
+            self.escolha_frame = tk.Frame(self.frame_menu, bg="#f0f8ff")
+            self.escolha_frame.pack(pady=10)
+            self.texto_escolha = tk.Label(
+                self.escolha_frame,
+                text=f"Nível (1 a {quantidade_niveis}):",
+                font=("Helvetica", 14),
+                bg="#f0f8ff",
+            )
+            self.texto_escolha.pack(side=tk.LEFT)
+            self.escolha_nivel = tk.Spinbox(
+                self.escolha_frame, from_=1, to=quantidade_niveis, width=7, font=("Helvetica", 14)
+            )
+            self.escolha_nivel.pack(side=tk.LEFT, padx=10)
+            self.escolha_nivel.bind("<Return>", lambda event: self.selecionar_nivel_escolhido())
+            self.botao_escolher = tk.Button(
+                self.escolha_frame,
+                text="Jogar",
+                font=("Helvetica", 14, "bold"),
+                bg="#4caf50",  # Verde
+                fg="white",  # Texto branco
+                activebackground="#45a049",
+                activeforeground="white",
+                command=self.selecionar_nivel_escolhido,  # Callback ao clicar no botão
+            )
+            self.botao_escolher.pack(side=tk.LEFT)
 
         # Botão adicional para exibir "Como Jogar"
         self.botao_como_jogar = tk.Button(
@@ -174,6 +1126,16 @@ class MenuInicial:
         self.frame_menu.destroy()  # Remove o menu inicial
         self.iniciar_jogo_callback(nivel)  # Chama a função para iniciar o jogo
 
+    def selecionar_nivel_escolhido(self):
+        """
+        Inicia o nível escrito na caixa de escolha, ou assinala a caixa se o número não for válido.
+        """
+        nivel = ler_numero_nivel(self.escolha_nivel.get(), self.quantidade_niveis)
+        if nivel is None:
+            self.escolha_nivel.config(bg="#ffcdd2")  # Fundo vermelho claro para indicar o erro
+            return
+        self.selecionar_nivel(nivel)
+
     def mostrar_como_jogar(self):
         """
         Exibe a explicação de como jogar o jogo.
@@ -230,29 +1192,30 @@ class MenuInicial:
         Destroi o ecrã atual e recria o menu inicial.
         """
         self.frame_como_jogar.destroy()  # Remove o ecrã atual
-        self.__init__(self.master, self.iniciar_jogo_callback)  # Recria o menu inicial
+        self.__init__(self.master, self.iniciar_jogo_callback, self.quantidade_niveis)  # Recria o menu inicial
 
 
 class JogoBubbleShooter:
     """Classe principal que gere a lógica do jogo e as interações."""
-    def __init__(self, master: tk.Tk, nivel: int, voltar_menu_callback):
+    def __init__(self, master: tk.Tk, nivel: int, voltar_menu_callback,
+                 banco: Optional[BancoTabuleiros] = None, pacote: Optional[PacoteNiveis] = None):
         """
         Inicializa o jogo para o nível selecionado.
+        Se for indicado um banco, os tabuleiros são retirados dele em vez de gerados na hora.
+        Se for indicado um pacote, o nível e a sua grelha são lidos do pacote.
         """
         self.master = master
         self.nivel = nivel
         self.voltar_menu_callback = voltar_menu_callback
+        self.banco = banco
+        self.pacote = pacote
 
         # Cria o canvas para desenhar o jogo
         self.canvas = tk.Canvas(master, width=LARGURA, height=ALTURA, bg="white")
         self.canvas.pack()  # Posiciona o canvas na janela principal
 
         # Configurações de cada nível (formas, colunas e linhas)
-        self.formas_por_nivel = {
-            1: {"formas": ["Círculo", "Quadrado", "Triângulo"], "colunas": 10, "linhas": 6},
-            2: {"formas": ["Círculo", "Quadrado", "Triângulo", "Retângulo"], "colunas": 12, "linhas": 7},
-            3: {"formas": list(FORMAS.keys()), "colunas": 14, "linhas": 8},
-        }
+        self.formas_por_nivel = FORMAS_POR_NIVEL
 
         # Configuração de cores de fundo por nível
         self.fundos_por_nivel = {
@@ -274,11 +1237,13 @@ class JogoBubbleShooter:
         # Configuração inicial do jogo
         self.atualizar_dificuldade()  # Ajusta as configurações com base no nível
 
+        # Modelo do tabuleiro e renderizador que desenha apenas o que muda em cada frame
+        self.tabuleiro = TabuleiroJogo(COLUNAS, LINHAS, TAMANHO_BOLA)
+        self.renderizador = RenderizadorTabuleiro(self.canvas, self.tabuleiro)
+
         # Variáveis de estado do jogo
-        self.figura_jogador = None  # Figura controlada pelo jogador
-        self.linha_direcao = None  # Linha que mostra a direção do disparo
         self.movendo = False  # Indica se a figura está em movimento
-        self.texto_figura = None  # Texto descritivo exibido no canvas
+        self.exibicoes_nome = 0  # Conta os nomes exibidos, para só apagar o mais recente
 
         # Inicializa o tabuleiro e a figura do jogador
         self.preencher_grade()  # Preenche o topo do canvas com figuras aleatórias
@@ -297,18 +1262,23 @@ class JogoBubbleShooter:
         Atualiza as configurações do jogo de acordo com o nível selecionado.
         Define o número de colunas, linhas e formas disponíveis no nível.
         """
-        if self.nivel in self.formas_por_nivel:
-            config = self.formas_por_nivel[self.nivel]  # Configurações específicas do nível
+        if self.pacote is not None:
+            self.config_nivel = self.pacote.nivel(self.nivel)  # Lê apenas este nível do pacote
+        else:
+            self.config_nivel = self.formas_por_nivel.get(self.nivel)
+
+        if self.config_nivel is not None:
+            config = self.config_nivel  # Configurações específicas do nível
             global COLUNAS, LINHAS, TAMANHO_BOLA, FORMAS
             COLUNAS = config["colunas"]  # Atualiza o número de colunas
             LINHAS = config["linhas"]  # Atualiza o número de linhas
-            TAMANHO_BOLA = LARGURA // COLUNAS  # Calcula o tamanho das bolas dinamicamente
+            TAMANHO_BOLA = tamanho_celula(COLUNAS, LINHAS)  # Calcula o tamanho das bolas dinamicamente
 
             # Filtra apenas as formas disponíveis neste nível
             self.formas_nivel = {forma: FORMAS[forma] for forma in config["formas"]}
 
         # Ajusta a cor de fundo do nível
-        fundo = self.fundos_por_nivel[self.nivel]
+        fundo = self.fundos_por_nivel[(self.nivel - 1) % len(self.fundos_por_nivel) + 1]
         self.canvas.config(bg=fundo["cor"])  # Define a cor de fundo do canvas
 
 
@@ -348,57 +1318,80 @@ class JogoBubbleShooter:
         """
         Volta ao menu inicial, limpando o canvas atual.
         """
+        self.movendo = False  # Para o movimento em curso
+        self.renderizador.encerrar()  # Cancela o frame pendente
         self.canvas.destroy()  # Remove o canvas do jogo
         self.voltar_menu_callback()  # Chama a função para recriar o menu inicial
 
     def reiniciar_jogo(self, event=None):
         """
         Reinicia o estado do jogo atual.
+        Só as células diferentes do novo tabuleiro são redesenhadas.
         """
-        self.canvas.delete("all")  # Remove todos os elementos do canvas
-        self.figura_jogador = None  # Reseta a figura controlada pelo jogador
-        self.linha_direcao = None  # Remove a linha de direção
         self.movendo = False  # Indica que não há movimento
-        self.texto_figura = None  # Reseta o texto exibido
+        self.tabuleiro.definir_tiro(None)  # Remove a figura do jogador
+        self.tabuleiro.definir_mira(None)  # Remove a linha de direção
+        self.tabuleiro.definir_texto("nome", "")  # Esconde o nome da última figura combinada
         self.preencher_grade()  # Recria a grade inicial
         self.criar_figura_jogador()  # Recria a figura do jogador
-        self.adicionar_botao_reiniciar()  # Recria o botão "Reiniciar"
-        self.adicionar_botao_voltar_menu()  # Recria o botão "Menu"
-        self.texto_descricao = None  # Reseta a descrição da figura
-        
 
     def preencher_grade(self):
         """
         Preenche o topo do canvas com bolas contendo figuras geométricas.
         """
+        if self.pacote is not None:
+            self.preencher_grade_pacote()
+            return
+
+        # Retira um tabuleiro pronto do banco ou, se estiver vazio, gera um na hora
+        codigos = self.banco.retirar(self.nivel) if self.banco else None
+        if codigos is None:
+            codigos = gerar_tabuleiro_valido(self.nivel, random.Random())
+        if codigos is None:
+            # Nenhum tabuleiro passou os critérios: o jogo não pode ficar sem tabuleiro,
+            # por isso aceita-se aqui (e só aqui) um tabuleiro aleatório sem filtro
+            config = FORMAS_POR_NIVEL[self.nivel]
+            codigos = gerar_tabuleiro(config["formas"], config["colunas"], config["linhas"], random.Random())
+
         # Inicializa a grade como uma matriz vazia
-        self.grade = [[None for _ in range(COLUNAS)] for _ in range(LINHAS)]
+        grade = [[None for _ in range(COLUNAS)] for _ in range(LINHAS)]
         # Adiciona figuras geométricas nas primeiras linhas da grade
         for linha in range(LINHAS // 2):  # Apenas metade das linhas são preenchidas
             for coluna in range(COLUNAS):
-                # Seleciona aleatoriamente uma figura e a sua cor
-                tipo_figura = random.choice(list(self.formas_nivel.keys()))
-                cor = FORMAS[tipo_figura]
-                # Calcula as coordenadas da célula
-                x, y = self.calcular_posicao_celula(linha, coluna)
-                # Desenha a bola com a figura e adiciona à grade
-                figura = self.desenhar_bola_com_figura(x, y, tipo_figura, cor)
-                self.grade[linha][coluna] = figura
+                # Obtém a figura guardada no tabuleiro
+                grade[linha][coluna] = CODIGOS_FORMAS[codigos[linha * COLUNAS + coluna]]
+        # Carrega a grade no modelo, que só emite eventos para as células alteradas
+        self.tabuleiro.carregar(grade)
+
+    def preencher_grade_pacote(self):
+        """
+        Preenche a grade com a disposição do nível lida do pacote.
+        """
+        grade = []
+        for linha in self.config_nivel["celulas"]:
+            grade.append([])
+            for codigo in linha:
+                if codigo == CELULA_VAZIA:
+                    grade[-1].append(None)
+                elif codigo == CELULA_ALEATORIA:
+                    grade[-1].append(random.choice(list(self.formas_nivel.keys())))
+                else:
+                    grade[-1].append(CODIGOS_FORMAS[codigo])
+        self.tabuleiro.carregar(grade)
 
     def criar_figura_jogador(self):
         """
         Cria a figura controlada pelo jogador no centro inferior do canvas.
         """
-        if self.figura_jogador is not None:  # Se já existir, não cria outra
+        if self.tabuleiro.tiro is not None:  # Se já existir, não cria outra
             return
-        # Seleciona aleatoriamente o tipo de figura e a sua cor
+        # Seleciona aleatoriamente o tipo de figura
         tipo_figura = random.choice(list(self.formas_nivel.keys()))
-        cor = self.formas_nivel[tipo_figura]
         # Calcula a posição inicial no centro inferior
         x = (LARGURA // 2) - (TAMANHO_BOLA // 2)
         y = ALTURA - (TAMANHO_BOLA * 1.5)
-        # Desenha a bola controlada pelo jogador
-        self.figura_jogador = self.desenhar_bola_com_figura(x, y, tipo_figura, cor)
+        # Coloca a figura controlada pelo jogador no tabuleiro
+        self.tabuleiro.definir_tiro(tipo_figura, x, y)
         self.atualizar_texto_figura(tipo_figura)  # Atualiza o texto com o tipo de figura
         self.atualizar_texto_descricao(tipo_figura)  # Mostra a descrição da figura
 
@@ -406,124 +1399,35 @@ class JogoBubbleShooter:
         """
         Atualiza o texto exibido no canto inferior direito com o tipo da figura atual.
         """
-        if self.texto_figura:
-            self.canvas.delete(self.texto_figura)  # Remove o texto anterior
-        # Cria o texto no canto inferior direito do canvas
-        self.texto_figura = self.canvas.create_text(
-            LARGURA - 10, ALTURA - 20,
-            text=f"Figura Atual: {tipo_figura}",
-            font=("Helvetica", 14, "bold"),
-            fill="black",
-            anchor="se"  # Alinha o texto à direita
-        )
-
-    def calcular_posicao_celula(self, linha: int, coluna: int) -> Tuple[int, int]:
-        """
-        Calcula as coordenadas (x, y) do canto superior esquerdo de uma célula na grelha.
-        """
-        x = coluna * TAMANHO_BOLA  # Posição x com base na coluna
-        y = linha * TAMANHO_BOLA  # Posição y com base na linha
-        return x, y
-
-    def desenhar_bola_com_figura(self, x: int, y: int, tipo_figura: str, cor: str):
-        """
-        Desenha uma bola no canvas com uma figura geométrica centralizada dentro.
-        """
-        margem = 3  # Margem para separar as bordas
-        # Desenha a bola (um círculo cinzento)
-        bola = self.canvas.create_oval(
-            x + margem, y + margem,
-            x + TAMANHO_BOLA - margem, y + TAMANHO_BOLA - margem,
-            fill="lightgray", outline="black"
-        )
-        # Desenha a figura geométrica centralizada dentro da bola
-        figura = self.desenhar_figura_centralizada(x, y, tipo_figura, cor)
-        return bola, figura, tipo_figura  # Retorna os elementos criados
-
-    def desenhar_figura_centralizada(self, x: int, y: int, tipo_figura: str, cor: str):
-        """
-        Desenha a figura geométrica centralizada dentro de uma célula.
-        """
-        centro_x = x + TAMANHO_BOLA // 2  # Calcula o centro da célula em x
-        centro_y = y + TAMANHO_BOLA // 2  # Calcula o centro da célula em y
-
-        # Desenha a figura com base no tipo
-        if tipo_figura == "Círculo":
-            raio = TAMANHO_BOLA // 3  # Raio proporcional ao tamanho da célula
-            return self.canvas.create_oval(
-                centro_x - raio, centro_y - raio, centro_x + raio, centro_y + raio, fill=cor
-            )
-        elif tipo_figura == "Quadrado":
-            lado = TAMANHO_BOLA // 2  # Lado proporcional ao tamanho da célula
-            return self.canvas.create_rectangle(
-                centro_x - lado // 2, centro_y - lado // 2,
-                centro_x + lado // 2, centro_y + lado // 2, fill=cor
-            )
-        elif tipo_figura == "Triângulo":
-            return self.desenhar_poligono(centro_x, centro_y, 3, TAMANHO_BOLA // 3, cor)
-        elif tipo_figura == "Hexágono":
-            return self.desenhar_poligono(centro_x, centro_y, 6, TAMANHO_BOLA // 3, cor)
-        elif tipo_figura == "Pentágono":
-            return self.desenhar_poligono(centro_x, centro_y, 5, TAMANHO_BOLA // 3, cor)
-        elif tipo_figura == "Retângulo":
-            largura = TAMANHO_BOLA // 2
-            altura = TAMANHO_BOLA // 3
-            return self.canvas.create_rectangle(
-                centro_x - largura // 2, centro_y - altura // 2,
-                centro_x + largura // 2, centro_y + altura // 2, fill=cor
-            )
+        self.tabuleiro.definir_texto("figura", f"Figura Atual: {tipo_figura}")
 
-    def desenhar_poligono(self, x: int, y: int, lados: int, raio: int, cor: str):
+    def centro_figura_jogador(self) -> Tuple[float, float]:
         """
-        Desenha um polígono regular no canvas.
+        Calcula o centro da bola do jogador.
         """
-        # Calcula os pontos (vértices) do polígono
-        pontos = [
-            (x + raio * math.cos(2 * math.pi * i / lados),
-             y + raio * math.sin(2 * math.pi * i / lados))
-            for i in range(lados)
-        ]
-        # Desenha o polígono no canvas
-        return self.canvas.create_polygon(pontos, fill=cor, outline="black")
+        _, x, y = self.tabuleiro.tiro
+        return x + TAMANHO_BOLA / 2, y + TAMANHO_BOLA / 2
 
     def tratar_colisao(self, linha: int, coluna: int) -> None:
         """
         Trata das colisões entre a figura do jogador e uma figura da grelha.
         """
-        # Obtém as cores da figura do jogador e da grade
-        cor_jogador = self.canvas.itemcget(self.figura_jogador[1], "fill")
-        cor_grade = self.canvas.itemcget(self.grade[linha][coluna][1], "fill")
+        # Obtém as figuras do jogador e da grade (cada figura tem uma cor própria)
+        tipo_figura = self.tabuleiro.tiro[0]
+        tipo_grade = self.tabuleiro.celulas[linha][coluna]
 
-        if cor_jogador == cor_grade:  # Se as cores forem iguais
-            tipo_figura = self.figura_jogador[2]  # Tipo da figura do jogador
+        if tipo_figura == tipo_grade:  # Se as cores forem iguais
             self.exibir_nome_figura(tipo_figura)  # Exibe o nome da figura combinada
-
-            # Remove ambas as figuras (do jogador e da grade)
-            self.canvas.delete(self.grade[linha][coluna][0])  # Remove a bola
-            self.canvas.delete(self.grade[linha][coluna][1])  # Remove a figura
-            self.canvas.delete(self.figura_jogador[0])  # Remove a bola do jogador
-            self.canvas.delete(self.figura_jogador[1])  # Remove a figura do jogador
-            self.grade[linha][coluna] = None  # Liberta a célula na grade
+            self.tabuleiro.definir_celula(linha, coluna, None)  # Liberta a célula na grade
         else:
-            # Se as cores não forem iguais, tenta reposicionar a figura do jogador
+            # Se as cores não forem iguais, tenta colocar a figura do jogador numa célula livre
             nova_linha, nova_coluna = self.encontrar_posicao_disponivel(linha, coluna)
             if nova_linha is not None:
-                # Calcula a nova posição da célula disponível
-                x, y = self.calcular_posicao_celula(nova_linha, nova_coluna)
-                # Move a bola para a nova posição
-                self.canvas.coords(
-                    self.figura_jogador[0], x + 3, y + 3, x + TAMANHO_BOLA - 3, y + TAMANHO_BOLA - 3
-                )
-                # Remove a figura antiga e cria uma nova centralizada
-                self.canvas.delete(self.figura_jogador[1])
-                nova_figura = self.desenhar_figura_centralizada(x, y, self.figura_jogador[2], cor_jogador)
-                # Atualiza a figura do jogador na nova posição
-                self.figura_jogador = (self.figura_jogador[0], nova_figura, self.figura_jogador[2])
-                self.grade[nova_linha][nova_coluna] = self.figura_jogador
+                self.tabuleiro.definir_celula(nova_linha, nova_coluna, tipo_figura)
 
         # Reseta o estado de movimento e cria uma nova figura para o jogador
         self.movendo = False
-        self.figura_jogador = None
+        self.tabuleiro.definir_tiro(None)
         self.criar_figura_jogador()
 
     def encontrar_posicao_disponivel(self, linha: int, coluna: int) -> Tuple[Optional[int], Optional[int]]:
@@ -532,14 +1436,14 @@ class JogoBubbleShooter:
         """
         # Procura na mesma coluna para as linhas seguintes
         for l in range(linha + 1, LINHAS):
-            if not self.grade[l][coluna]:  # Se a célula estiver vazia
+            if not self.tabuleiro.celulas[l][coluna]:  # Se a célula estiver vazia
                 return l, coluna
 
         # Procura em colunas adjacentes
         for c in [coluna - 1, coluna + 1]:
             if 0 <= c < COLUNAS:  # Garante que a coluna está dentro dos limites
                 for l in range(LINHAS):
-                    if not self.grade[l][c]:  # Se a célula estiver vazia
+                    if not self.tabuleiro.celulas[l][c]:  # Se a célula estiver vazia
                         return l, c
 
         return None, None  # Retorna (None, None) se não encontrar posição disponível
@@ -551,49 +1455,47 @@ class JogoBubbleShooter:
         if self.movendo:  # Se a figura está em movimento, não atualiza a linha
             return
 
-        if self.linha_direcao:  # Remove a linha de direção anterior, se existir
-            self.canvas.delete(self.linha_direcao)
+        if self.tabuleiro.tiro is None:
+            self.tabuleiro.definir_mira(None)
+            return
 
-        if self.figura_jogador is not None:
-            # Obtém as coordenadas do centro da bola do jogador
-            bola_coords = self.canvas.coords(self.figura_jogador[0])
-            jogador_centro_x = (bola_coords[0] + bola_coords[2]) / 2
-            jogador_centro_y = (bola_coords[1] + bola_coords[3]) / 2
+        # Obtém as coordenadas do centro da bola do jogador
+        jogador_centro_x, jogador_centro_y = self.centro_figura_jogador()
 
-            # A linha só é desenhada se o rato estiver acima da bola do jogador
-            if event.y > jogador_centro_y:
-                return
+        # A linha só é desenhada se o rato estiver acima da bola do jogador
+        if event.y > jogador_centro_y:
+            self.tabuleiro.definir_mira(None)
+            return
 
-            # Cria uma linha de direção entre o centro da bola e a posição do rato
-            self.linha_direcao = self.canvas.create_line(
-                jogador_centro_x, jogador_centro_y, event.x, event.y, fill="gray", dash=(4, 2)
-            )
+        # Liga o centro da bola à posição do rato
+        self.tabuleiro.definir_mira((jogador_centro_x, jogador_centro_y, event.x, event.y))
 
     def exibir_nome_figura(self, nome_figura: str):
         """
         Exibe o nome da figura combinada no centro do canvas por 1 segundo.
         """
-        # Cria o texto no centro do canvas
-        texto = self.canvas.create_text(
-            LARGURA // 2, ALTURA // 2,  # Coordenadas do centro
-            text=nome_figura,
-            font=("Helvetica", 24, "bold"),
-            fill="black"  # Cor preta para o texto
-        )
-        # Remove o texto após 1 segundo
-        self.canvas.after(1000, lambda: self.canvas.delete(texto))
+        self.tabuleiro.definir_texto("nome", nome_figura)
+        self.exibicoes_nome += 1
+        exibicao = self.exibicoes_nome
+        # Esconde o texto após 1 segundo, se entretanto não tiver sido exibido outro nome
+        self.canvas.after(1000, lambda: self.esconder_nome_figura(exibicao))
+
+    def esconder_nome_figura(self, exibicao: int):
+        """
+        Esconde o nome da figura combinada se ainda for o da exibição indicada.
+        """
+        if exibicao == self.exibicoes_nome and self.canvas.winfo_exists():
+            self.tabuleiro.definir_texto("nome", "")
 
     def disparar_figura(self, event: tk.Event) -> None:
         """
         Inicia o movimento da figura do jogador na direção do clique do rato.
         """
-        if self.movendo or self.figura_jogador is None:  # Ignora se já está em movimento
+        if self.movendo or self.tabuleiro.tiro is None:  # Ignora se já está em movimento
             return
 
         # Obtém o centro da bola do jogador
-        bola_coords = self.canvas.coords(self.figura_jogador[0])
-        jogador_centro_x = (bola_coords[0] + bola_coords[2]) / 2
-        jogador_centro_y = (bola_coords[1] + bola_coords[3]) / 2
+        jogador_centro_x, jogador_centro_y = self.centro_figura_jogador()
 
         # O clique deve estar acima da bola do jogador para iniciar o movimento
         if event.y > jogador_centro_y:
@@ -614,23 +1516,18 @@ class JogoBubbleShooter:
             return
 
         for _ in range(5):  # Move a figura em pequenos incrementos para suavizar o movimento
-            self.canvas.move(self.figura_jogador[0], dx / 5, dy / 5)  # Move a bola
-            self.canvas.move(self.figura_jogador[1], dx / 5, dy / 5)  # Move a figura
-            bola_coords = self.canvas.coords(self.figura_jogador[0])
+            self.tabuleiro.mover_tiro(dx / 5, dy / 5)  # O desenho é atualizado uma vez por frame
+            bola_coords = self.tabuleiro.coordenadas_bola(*self.tabuleiro.tiro[1:])
 
             # Verifica colisões com as bordas do canvas
             if bola_coords[0] <= 0 or bola_coords[2] >= LARGURA:  # Borda esquerda/direita
                 dx = -dx  # Inverte a direção horizontal
 
             # Verifica colisões com outras figuras na grade
-            for linha in range(LINHAS):
-                for coluna in range(COLUNAS):
-                    if self.grade[linha][coluna]:  # Se a célula contém uma figura
-                        figura, tipo = self.grade[linha][coluna][0:2]
-                        figura_coords = self.canvas.coords(figura)
-                        if self.colisao(bola_coords, figura_coords):  # Se houve colisão
-                            self.tratar_colisao(linha, coluna)
-                            return
+            linha, coluna = self.celula_em_colisao(bola_coords)
+            if linha is not None:
+                self.tratar_colisao(linha, coluna)
+                return
 
             # Verifica se a bola atinge o topo do canvas
             if bola_coords[1] <= 0:
@@ -641,6 +1538,23 @@ class JogoBubbleShooter:
         # Continua o movimento após um pequeno intervalo
         self.canvas.after(20, lambda: self.mover_figura(dx, dy))
 
+    def celula_em_colisao(self, bola_coords) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Procura a primeira célula preenchida (por linha e coluna) que colide com a bola.
+        Como a colisão exige centros a menos de uma célula de distância, basta verificar
+        a célula do centro da bola e as suas vizinhas, mesmo em grelhas muito grandes.
+        """
+        linha_centro = int((bola_coords[1] + bola_coords[3]) / 2 // TAMANHO_BOLA)
+        coluna_centro = int((bola_coords[0] + bola_coords[2]) / 2 // TAMANHO_BOLA)
+        for linha in range(max(linha_centro - 1, 0), min(linha_centro + 2, LINHAS)):
+            for coluna in range(max(coluna_centro - 1, 0), min(coluna_centro + 2, COLUNAS)):
+                if self.tabuleiro.celulas[linha][coluna]:  # Se a célula contém uma figura
+                    x, y = self.tabuleiro.calcular_posicao_celula(linha, coluna)
+                    figura_coords = self.tabuleiro.coordenadas_bola(x, y)
+                    if self.colisao(bola_coords, figura_coords):  # Se houve colisão
+                        return linha, coluna
+        return None, None
+
     def colisao(self, bola_coords, figura_coords) -> bool:
         """
         Verifica se há colisão entre duas bolas.
@@ -663,11 +1577,7 @@ class JogoBubbleShooter:
         """
         Reposiciona a figura do jogador após atingir o topo ou terminar o movimento.
         """
-        if self.figura_jogador:
-            # Remove a figura antiga do canvas
-            self.canvas.delete(self.figura_jogador[0])
-            self.canvas.delete(self.figura_jogador[1])
-        self.figura_jogador = None  # Reseta a referência da figura do jogador
+        self.tabuleiro.definir_tiro(None)  # Remove a figura antiga
         self.criar_figura_jogador()  # Cria uma nova figura
     
     def atualizar_texto_descricao(self, tipo_figura: str):
@@ -675,34 +1585,58 @@ class JogoBubbleShooter:
         Atualiza o texto mostrado no canvas com a descrição da figura atual.
         """
         descricao = self.descricoes_figuras.get(tipo_figura, "")  # Obtém a descrição da figura
-        if hasattr(self, "texto_descricao"):  # Se o texto já existir no canvas
-            self.canvas.itemconfig(self.texto_descricao, text=descricao)  # Atualiza o texto
-        else:  # Caso contrário, cria um novo texto no canvas
-            self.texto_descricao = self.canvas.create_text(
-                LARGURA - 115, ALTURA - 60,  # Coordenadas no canto inferior direito
-                text=descricao,
-                font=("Helvetica", 14, "italic"),
-                fill="black",
-            )
+        self.tabuleiro.definir_texto("descricao", descricao)
 
 
 if __name__ == "__main__":
     """
     Código principal que inicializa o jogo e o menu inicial.
     """
+    parser = argparse.ArgumentParser(description="Lança Figuras")
+    parser.add_argument("--pacote", help="joga os níveis de um pacote binário em vez dos níveis padrão")
+    parser.add_argument("--converter", nargs=2, metavar=("TEXTO", "PACOTE"),
+                        help="converte um ficheiro de níveis em texto num pacote binário e termina")
+    parser.add_argument("--medir", action="store_true",
+                        help="mede o tempo de abrir pacotes e mudar de nível e termina")
+    argumentos = parser.parse_args()
+
+    if argumentos.converter:
+        quantidade = converter_texto_para_pacote(*argumentos.converter)
+        print(f"{quantidade} níveis escritos em {argumentos.converter[1]}")
+        sys.exit()
+
+    if argumentos.medir:
+        print(f"{'níveis':>8} {'bytes':>10} {'abrir (ms)':>12} {'mudar (ms)':>12}")
+        for quantidade, tamanho, abrir, mudar in medir_pacotes():
+            print(f"{quantidade:>8} {tamanho:>10} {abrir:>12.3f} {mudar:>12.4f}")
+        sys.exit()
+
+    # Pacote de níveis opcional, aberto com mmap e lido nível a nível
+    pacote = PacoteNiveis(argumentos.pacote) if argumentos.pacote else None
+    quantidade_niveis = pacote.quantidade if pacote else len(FORMAS_POR_NIVEL)
+
     root = tk.Tk()  # Cria a janela principal do jogo
 
+    # Banco de tabuleiros partilhado por todos os jogos, enchido em segundo plano
+    banco = BancoTabuleiros()
+    if pacote is None:
+        for nivel_banco in FORMAS_POR_NIVEL:
+            banco.reabastecer(nivel_banco)
+
     def iniciar_jogo(nivel: int):
         """
         Callback para iniciar o jogo com o nível selecionado.
         """
-        JogoBubbleShooter(root, nivel, voltar_menu)  # Cria a instância do jogo
+        JogoBubbleShooter(root, nivel, voltar_menu, banco, pacote)  # Cria a instância do jogo
 
     def voltar_menu():
         """
         Callback para retornar ao menu inicial.
         """
-        MenuInicial(root, iniciar_jogo)  # Cria a instância do menu inicial
+        MenuInicial(root, iniciar_jogo, quantidade_niveis)  # Cria a instância do menu inicial
 
     voltar_menu()  # Inicializa o menu inicial
-    root.mainloop()  # Inicia o loop principal da aplicação
\ No newline at end of file
+    root.mainloop()  # Inicia o loop principal da aplicação
+    banco.encerrar()  # Termina os processos de geração de tabuleiros
+    if pacote:
+        pacote.fechar()
\ No newline at end of file
@@ -0,0 +1,361 @@
+import os
+import random
+
+import pytest
+
+import jogo
+
+
+def test_tamanhos_grupos_juntam_vizinhos_da_mesma_forma():
+    # 0 0 1
+    # 0 1 1
+    assert sorted(jogo.tamanhos_grupos(bytes([0, 0, 1, 0, 1, 1]), 3)) == [3, 3]
+    # Células na diagonal não pertencem ao mesmo grupo
+    assert sorted(jogo.tamanhos_grupos(bytes([0, 1, 1, 0]), 2)) == [1, 1, 1, 1]
+
+
+def test_tabuleiro_equilibrado():
+    assert jogo.tabuleiro_equilibrado(bytes([0, 1, 2] * 4), [0, 1, 2])
+    assert not jogo.tabuleiro_equilibrado(bytes([0] * 10 + [1, 2]), [0, 1, 2])
+    assert not jogo.tabuleiro_equilibrado(bytes([0, 1] * 6), [0, 1, 2])  # Forma 2 em falta
+
+
+def test_grupos_aceitaveis():
+    pares = bytes([0, 0, 1, 1, 2, 2, 0, 0, 1, 1,
+                   1, 1, 2, 2, 0, 0, 1, 1, 2, 2,
+                   2, 2, 0, 0, 1, 1, 2, 2, 0, 0])
+    assert jogo.grupos_aceitaveis(pares, 10)
+    assert not jogo.grupos_aceitaveis(bytes([0] * 30), 10)  # Um grupo com todas as células
+    xadrez = bytes((linha + coluna) % 2 for linha in range(3) for coluna in range(10))
+    assert not jogo.grupos_aceitaveis(xadrez, 10)  # Todas as células isoladas
+
+
+def test_jogadas_para_limpar_tabuleiro_trivial():
+    rng = random.Random(0)
+    assert jogo.jogadas_para_limpar(bytes([0, 0, 0]), [0], 3, 4, rng, 100) == 3
+    assert jogo.jogadas_para_limpar(bytes([0, 0, 0]), [0], 3, 4, rng, 2) is None  # Limite curto
+
+
+def test_jogadas_para_limpar_perde_quando_uma_figura_chega_a_ultima_linha():
+    # Uma coluna de duas linhas: o tiro nunca corresponde e é colado na última linha
+    assert jogo.jogadas_para_limpar(bytes([0]), [1], 1, 2, random.Random(0), 100) is None
+
+
+def test_lote_descarta_tabuleiros_que_nao_passam_os_criterios(monkeypatch):
+    monkeypatch.setattr(jogo, "TENTATIVAS_POR_TABULEIRO", 3)
+    monkeypatch.setattr(jogo, "tabuleiro_aceitavel", lambda tabuleiro, nivel, rng: False)
+    assert jogo.gerar_tabuleiro_valido(1, random.Random(0)) is None
+    assert jogo.gerar_lote_tabuleiros(1, 5, 0) == b""
+
+
+def criar_banco(pasta):
+    """Banco sem reabastecimento (capacidade 0), que não arranca processos."""
+    return jogo.BancoTabuleiros(str(pasta), capacidade=0)
+
+
+def test_banco_guarda_e_le_tabuleiros(tmp_path):
+    banco = criar_banco(tmp_path)
+    tamanho = banco.tamanho_registo(1)
+    tabuleiros = [bytes([i % 3]) * tamanho for i in range(4)]
+    banco._filas[1].extend(tabuleiros)
+    banco.encerrar()  # Guarda as filas em disco
+
+    banco = criar_banco(tmp_path)
+    assert banco.quantidade(1) == 4
+    assert banco.quantidade(2) == 0
+    assert banco.retirar(1) == tabuleiros[0]
+    assert banco.ler(1) == tabuleiros  # O ficheiro só muda ao encerrar
+    banco.encerrar()
+
+
+@pytest.mark.parametrize("cabecalho", [
+    jogo.CABECALHO_BANCO.pack(b"XXXX", jogo.VERSAO_BANCO, 10, 6),  # Assinatura errada
+    jogo.CABECALHO_BANCO.pack(jogo.ASSINATURA_BANCO, jogo.VERSAO_BANCO, 9, 6),  # Colunas diferentes
+    jogo.CABECALHO_BANCO.pack(jogo.ASSINATURA_BANCO, jogo.VERSAO_BANCO, 10, 8),  # Linhas diferentes
+    b"",  # Ficheiro sem cabeçalho
+])
+def test_banco_ignora_ficheiro_com_cabecalho_diferente(tmp_path, cabecalho):
+    (tmp_path / "nivel_1.bin").write_bytes(cabecalho + bytes(30) * 3)
+    banco = criar_banco(tmp_path)
+    assert banco.quantidade(1) == 0
+    banco.encerrar()
+
+
+class CanvasFalso:
+    """Canvas sem janela: devolve identificadores novos e guarda o frame agendado."""
+    def __init__(self):
+        self.proximo_item = 0
+        self.frame = None
+
+    def after_idle(self, funcao):
+        self.frame = funcao
+        return "frame"
+
+    def after_cancel(self, identificador):
+        self.frame = None
+
+    def desenhar(self):
+        frame, self.frame = self.frame, None
+        frame()
+
+    def __getattr__(self, nome):
+        def chamar(*args, **kwargs):
+            self.proximo_item += 1
+            return self.proximo_item
+        return chamar
+
+
+def grade_aleatoria(semente: int):
+    """Cria uma grade 14x8 com as 4 primeiras linhas preenchidas."""
+    rng = random.Random(semente)
+    grade = [[None] * 14 for _ in range(8)]
+    for linha in range(4):
+        for coluna in range(14):
+            grade[linha][coluna] = rng.choice(jogo.CODIGOS_FORMAS)
+    return grade
+
+
+def criar_renderizador():
+    canvas = CanvasFalso()
+    tabuleiro = jogo.TabuleiroJogo(14, 8, 50)
+    return canvas, tabuleiro, jogo.RenderizadorTabuleiro(canvas, tabuleiro)
+
+
+def test_frame_inicial_desenha_todas_as_celulas():
+    canvas, tabuleiro, renderizador = criar_renderizador()
+    tabuleiro.carregar(grade_aleatoria(1))
+    canvas.desenhar()
+    # Cada célula preenchida custa a bola e a figura, mais uma chamada para baixar as células
+    assert list(renderizador.chamadas_por_frame) == [56 * 2 + 1]
+
+
+def test_reinicio_so_redesenha_celulas_diferentes():
+    canvas, tabuleiro, renderizador = criar_renderizador()
+    antiga, nova = grade_aleatoria(1), grade_aleatoria(2)
+    tabuleiro.carregar(antiga)
+    canvas.desenhar()
+
+    tabuleiro.carregar(nova)
+    canvas.desenhar()
+    diferentes = sum(a != b for linha_a, linha_b in zip(antiga, nova) for a, b in zip(linha_a, linha_b))
+    # Cada célula diferente apaga a bola e a figura antigas e cria as novas
+    assert renderizador.chamadas_por_frame[-1] == diferentes * 4 + 1
+
+    tabuleiro.carregar(nova)
+    assert canvas.frame is None  # Sem alterações, nenhum frame é agendado
+
+
+def test_varios_movimentos_do_tiro_num_frame_custam_dois_movimentos():
+    canvas, tabuleiro, renderizador = criar_renderizador()
+    tabuleiro.definir_tiro("Círculo", 300, 700)
+    canvas.desenhar()
+    for _ in range(5):
+        tabuleiro.mover_tiro(1, -2)
+    canvas.desenhar()
+    assert renderizador.chamadas_por_frame[-1] == 2
+    assert renderizador.itens_tiro[1:3] == (305, 690)
+
+
+def test_celula_alterada_e_reposta_no_mesmo_frame_nao_chama_o_tk():
+    canvas, tabuleiro, renderizador = criar_renderizador()
+    tabuleiro.carregar(grade_aleatoria(1))
+    canvas.desenhar()
+    tipo = tabuleiro.celulas[0][0]
+    tabuleiro.definir_celula(0, 0, None)
+    tabuleiro.definir_celula(0, 0, tipo)
+    canvas.desenhar()
+    assert renderizador.chamadas_por_frame[-1] == 0
+
+
+class CanvasComOrdem(CanvasFalso):
+    """Canvas falso que guarda a ordem de empilhamento dos itens (do fundo para o topo)."""
+    def __init__(self):
+        super().__init__()
+        self.ordem = []
+        self.etiquetas = {}
+
+    def criar(self, *args, tags=(), **kwargs):
+        self.proximo_item += 1
+        self.ordem.append(self.proximo_item)
+        self.etiquetas[self.proximo_item] = tuple(tags)
+        return self.proximo_item
+
+    create_oval = create_rectangle = create_polygon = create_line = create_text = criar
+
+    def delete(self, item):
+        self.ordem.remove(item)
+
+    def tag_lower(self, etiqueta):
+        # Como no Tk, os itens baixados mantêm a ordem entre si
+        baixados = [item for item in self.ordem if etiqueta in self.etiquetas[item]]
+        self.ordem = baixados + [item for item in self.ordem if item not in baixados]
+
+
+def test_celulas_novas_ficam_abaixo_do_tiro_da_mira_e_dos_textos():
+    canvas = CanvasComOrdem()
+    tabuleiro = jogo.TabuleiroJogo(10, 6, 70)
+    renderizador = jogo.RenderizadorTabuleiro(canvas, tabuleiro)
+    tabuleiro.carregar(grade_aleatoria(1)[:6])
+    tabuleiro.definir_tiro("Círculo", 300, 700)
+    tabuleiro.definir_mira((335, 735, 300, 100))
+    tabuleiro.definir_texto("nome", "Círculo")
+    canvas.desenhar()
+
+    # Uma figura colada e um reinício criam células depois do tiro, da mira e do texto
+    tabuleiro.definir_celula(5, 0, "Quadrado")
+    canvas.desenhar()
+    tabuleiro.carregar(grade_aleatoria(2)[:6])
+    tabuleiro.mover_tiro(5, -5)  # A mesma figura é deslocada em vez de recriada
+    canvas.desenhar()
+
+    celulas = {item for itens in renderizador.itens_celulas.values() for item in itens[1:]}
+    sobrepostos = {*renderizador.itens_tiro[3:], renderizador.item_mira, renderizador.itens_textos["nome"]}
+    posicao = {item: indice for indice, item in enumerate(canvas.ordem)}
+    assert max(posicao[item] for item in celulas) < min(posicao[item] for item in sobrepostos)
+
+
+TEXTO_NIVEIS = """
+# Dois níveis de teste
+nivel Círculo Hexágono
+C?H
+.HC
+
+nivel Quadrado Triângulo Retângulo Pentágono
+QTRPQ
+?.?.?
+TTTTT
+"""
+
+
+def test_texto_pacote_e_nivel_devolvem_a_mesma_grelha(tmp_path):
+    texto = tmp_path / "niveis.txt"
+    texto.write_text(TEXTO_NIVEIS, encoding="utf-8")
+    caminho = str(tmp_path / "niveis.lfp")
+    assert jogo.converter_texto_para_pacote(str(texto), caminho) == 2
+
+    c, q, t, h, p, r = (jogo.CODIGOS_FORMAS.index(forma) for forma in jogo.LETRAS_FORMAS.values())
+    aleatoria, vazia = jogo.CELULA_ALEATORIA, jogo.CELULA_VAZIA
+    with jogo.PacoteNiveis(caminho) as pacote:
+        assert pacote.quantidade == 2
+        # Colunas ímpares: a última célula de cada linha partilha o byte com o enchimento
+        assert pacote.nivel(1) == {
+            "formas": ["Círculo", "Hexágono"], "colunas": 3, "linhas": 2,
+            "celulas": [[c, aleatoria, h], [vazia, h, c]],
+        }
+        nivel = pacote.nivel(2)
+        assert nivel["formas"] == ["Quadrado", "Triângulo", "Pentágono", "Retângulo"]
+        assert nivel["celulas"] == [[q, t, r, p, q], [aleatoria, vazia, aleatoria, vazia, aleatoria], [t] * 5]
+        with pytest.raises(IndexError):
+            pacote.nivel(3)
+
+
+def test_niveis_padrao_correspondem_a_formas_por_nivel(tmp_path):
+    caminho = str(tmp_path / "niveis.lfp")
+    jogo.converter_texto_para_pacote(os.path.join(os.path.dirname(__file__), "niveis.txt"), caminho)
+    with jogo.PacoteNiveis(caminho) as pacote:
+        for numero, config in jogo.FORMAS_POR_NIVEL.items():
+            nivel = pacote.nivel(numero)
+            assert (nivel["formas"], nivel["colunas"], nivel["linhas"]) == (
+                config["formas"], config["colunas"], config["linhas"])
+
+
+@pytest.mark.parametrize("texto, mensagem", [
+    ("C\n", "Linha 1: grelha antes da primeira linha"),
+    ("nivel\nC\n", "Linha 1: o nível não indica as formas usadas"),
+    ("nivel Estrela\n", "Linha 1: forma desconhecida 'Estrela'"),
+    ("nivel Círculo\nCX\n", "Linha 2: letra desconhecida 'X'"),
+    ("nivel Círculo\nCC\nCCC\n", "Linha 3: esperadas 2 colunas, encontradas 3"),
+    ("nivel Círculo\n", "Nível 1: o nível não tem grelha"),
+    ("nivel Círculo\n" + "C" * 100 + "\n", "Nível 1: grelha de 100x1 não cabe no ecrã"),
+    ("nivel Círculo\nQQ\n", r"Linha 2: Quadrado \('Q'\) não é uma forma do nível"),
+    ("nivel Círculo Quadrado\nC?\n\nnivel Círculo\n.Q\n", r"Linha 5: Quadrado \('Q'\) não é uma forma do nível"),
+])
+def test_erros_do_formato_de_texto(texto, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        jogo.ler_niveis_texto(texto)
+
+
+def escrever_pacote_teste(caminho):
+    jogo.escrever_pacote(str(caminho), jogo.ler_niveis_texto(TEXTO_NIVEIS))
+    return caminho.read_bytes()
+
+
+def test_pacote_cortado_levanta_value_error(tmp_path):
+    caminho = tmp_path / "niveis.lfp"
+    dados = escrever_pacote_teste(caminho)
+    caminho.write_bytes(dados[:-2])  # Corta o fim dos dados do nível 2
+    with jogo.PacoteNiveis(str(caminho)) as pacote:
+        pacote.nivel(1)
+        with pytest.raises(ValueError, match="dados do nível 2 estão incompletos"):
+            pacote.nivel(2)
+
+    caminho.write_bytes(dados[:jogo.CABECALHO_PACOTE.size + 4])  # Corta o índice
+    with pytest.raises(ValueError, match="índice do pacote está incompleto"):
+        jogo.PacoteNiveis(str(caminho))
+
+
+def test_pacote_com_codigo_invalido_levanta_value_error(tmp_path):
+    caminho = tmp_path / "niveis.lfp"
+    dados = bytearray(escrever_pacote_teste(caminho))
+    dados[-1] = 0x77  # Código 7 não corresponde a nenhuma figura
+    caminho.write_bytes(bytes(dados))
+    with jogo.PacoteNiveis(str(caminho)) as pacote:
+        with pytest.raises(ValueError, match="códigos de célula inválidos"):
+            pacote.nivel(2)
+
+
+def test_pacote_com_forma_fora_do_nivel_levanta_value_error(tmp_path):
+    caminho = tmp_path / "niveis.lfp"
+    dados = bytearray(escrever_pacote_teste(caminho))
+    quadrado = jogo.CODIGOS_FORMAS.index("Quadrado")
+    dados[-1] = quadrado << 4 | quadrado
+    caminho.write_bytes(bytes(dados))
+    with jogo.PacoteNiveis(str(caminho)) as pacote:
+        pacote.nivel(2)  # O nível 2 declara quadrados, por isso é aceite
+
+    dados = bytearray(escrever_pacote_teste(caminho))
+    inicio_nivel_1 = jogo.ENTRADA_PACOTE.unpack_from(dados, jogo.CABECALHO_PACOTE.size)[3]
+    dados[inicio_nivel_1] = quadrado << 4 | quadrado  # O nível 1 só tem círculos e hexágonos
+    caminho.write_bytes(bytes(dados))
+    with jogo.PacoteNiveis(str(caminho)) as pacote:
+        with pytest.raises(ValueError, match="formas que não são do nível"):
+            pacote.nivel(1)
+
+
+def test_grelha_alta_cabe_acima_do_jogador():
+    tamanho = jogo.tamanho_celula(20, 30)
+    assert 30 * tamanho <= jogo.ALTURA_GRELHA
+    assert jogo.tamanho_celula(14, 8) == jogo.LARGURA // 14  # Os níveis padrão não mudam
+
+
+@pytest.mark.parametrize("texto, nivel", [("1", 1), (" 2500 ", 2500), ("5000", 5000), ("0", None),
+                                          ("5001", None), ("abc", None), ("", None)])
+def test_ler_numero_nivel_do_menu(texto, nivel):
+    assert jogo.ler_numero_nivel(texto, 5000) == nivel
+
+
+def test_colisao_so_com_vizinhas_igual_a_percorrer_toda_a_grelha(tmp_path, monkeypatch):
+    monkeypatch.setattr(jogo.tk, "Canvas", lambda *args, **kwargs: CanvasFalso())
+    for nome in ("COLUNAS", "LINHAS", "TAMANHO_BOLA"):
+        monkeypatch.setattr(jogo, nome, getattr(jogo, nome))  # O jogo altera-as; repõe no fim do teste
+    rng = random.Random(3)
+    colunas, linhas = 87, 81  # A maior grelha aceite com células de TAMANHO_MINIMO_CELULA
+    celulas = [[rng.choice([0, 1, jogo.CELULA_VAZIA]) for _ in range(colunas)] for _ in range(linhas)]
+    caminho = str(tmp_path / "grande.lfp")
+    jogo.escrever_pacote(caminho, [{"formas": ["Círculo", "Quadrado"], "colunas": colunas,
+                                    "linhas": linhas, "celulas": celulas}])
+    with jogo.PacoteNiveis(caminho) as pacote:
+        jogador = jogo.JogoBubbleShooter(None, 1, lambda: None, pacote=pacote)
+        tabuleiro = jogador.tabuleiro
+
+        def percorrer_toda_a_grelha(bola_coords):
+            for linha in range(linhas):
+                for coluna in range(colunas):
+                    if tabuleiro.celulas[linha][coluna] and jogador.colisao(
+                            bola_coords, tabuleiro.coordenadas_bola(*tabuleiro.calcular_posicao_celula(linha, coluna))):
+                        return linha, coluna
+            return None, None
+
+        for _ in range(300):
+            bola_coords = tabuleiro.coordenadas_bola(rng.uniform(-5, jogo.LARGURA), rng.uniform(-5, jogo.ALTURA))
+            assert jogador.celula_em_colisao(bola_coords) == percorrer_toda_a_grelha(bola_coords)